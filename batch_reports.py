@@ -0,0 +1,248 @@
+import argparse
+import csv
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import time
+from multiprocessing import Pool
+from string import Template
+
+from plotly.offline import get_plotlyjs_version
+from plotly.utils import PlotlyJSONEncoder
+
+import app
+from job_feed import JobFeed, live_job_data
+
+# ------------------------
+# Batch Configuration
+# ------------------------
+# Input is a CSV with one student per row: student_id, target_role and
+# optionally name, experience, projection_years and one column per skill
+# (1-5) using the names from the career form or from 'roles'.
+CHECKPOINT_NAME = "_completed.txt"
+DEFAULT_PROJECTION_YEARS = 5
+FORM_SKILLS = ['Python', 'Machine Learning', 'Cloud Computing']
+
+REPORT_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Career Report - $name</title>
+<script src="https://cdn.plot.ly/plotly-$plotly_version.min.js"></script>
+<style>
+body { font-family: sans-serif; max-width: 960px; margin: auto; color: #222; }
+h1, h2 { color: #4287f5; }
+table { border-collapse: collapse; }
+td, th { border: 1px solid #ccc; padding: 6px 10px; text-align: left; }
+</style>
+</head>
+<body>
+<h1>Career Report: $name</h1>
+<p><b>Target role:</b> $role &middot; <b>Experience:</b> $experience years</p>
+<p>$mentor</p>
+<h2>Career Potential</h2>
+<div id="radar"></div>
+<table>$metrics</table>
+<h2>Career Timeline Projection</h2>
+<div id="timeline"></div>
+<h2>Skill Gaps</h2>
+$gaps
+<h2>Course Plan</h2>
+$courses
+<h2>Roadmap</h2>
+$roadmap
+<script>
+Plotly.newPlot("radar", $radar_data, $radar_layout, {staticPlot: true});
+Plotly.newPlot("timeline", $timeline_data, $timeline_layout, {staticPlot: true});
+</script>
+</body>
+</html>
+""")
+
+# Read-only state for each worker process, installed once by init_worker
+_context = None
+
+
+# ------------------------
+# Shared Context
+# ------------------------
+def figure_template(fig, data_keys):
+    # Serialize a figure once and strip its per-student data, so each report
+    # only has to fill in a few numbers instead of building a new figure.
+    spec = json.loads(json.dumps(fig.to_plotly_json(), cls=PlotlyJSONEncoder))
+    trace = spec['data'][0]
+    for key in data_keys:
+        trace.pop(key, None)
+    return {'trace': trace, 'layout': json.dumps(spec['layout'])}
+
+
+def build_context(out_dir):
+    _, roles, job_data, courses, _ = app.generate_data()
+    job_data = live_job_data(job_data, JobFeed())
+    courses_by_skill = {}
+    for course in courses.to_dict('records'):
+        courses_by_skill.setdefault(course['skill'], []).append(course)
+    return {
+        'out_dir': out_dir,
+        'roles': roles,
+        'job_data': {row['role']: row for row in job_data.to_dict('records')},
+        'courses': courses_by_skill,
+        'known_skills': set(FORM_SKILLS).union(*roles.values()),
+        'radar': figure_template(app.create_radar_chart([0] * 6), ('r',)),
+        'timeline': figure_template(app.create_career_timeline(job_data.iloc[0], 1), ('x', 'y')),
+    }
+
+
+def init_worker(context):
+    global _context
+    _context = context
+
+
+# ------------------------
+# Report Rendering
+# ------------------------
+def report_path(out_dir, student_id):
+    # The readable part is sanitized for the filesystem, which can map
+    # different ids ('a/b', 'a_b') to the same name; the hash of the raw id
+    # keeps them apart.
+    readable = re.sub(r"[^\w.-]", "_", student_id)[:80]
+    digest = hashlib.sha1(student_id.encode("utf-8")).hexdigest()[:10]
+    return os.path.join(out_dir, f"{readable}-{digest}.html")
+
+
+def student_skills(student, known_skills):
+    skills = {}
+    for skill, value in student.items():
+        if skill in known_skills and value not in (None, ""):
+            skills[skill] = int(float(value))
+    return skills
+
+
+def html_list(items):
+    if not items:
+        return "<p>None.</p>"
+    return "<ul>" + "".join(f"<li>{item}</li>" for item in items) + "</ul>"
+
+
+def render_report(student, ctx):
+    role = student['target_role']
+    required = ctx['roles'][role]
+    role_data = ctx['job_data'][role]
+    gaps = app.skill_gaps(required, student_skills(student, ctx['known_skills']))
+    metrics = app.career_metrics(role_data, required, gaps)
+    projection_years = int(student.get('projection_years') or DEFAULT_PROJECTION_YEARS)
+    years, progression = app.career_progression(role_data, projection_years)
+    experience = float(student.get('experience') or 0)
+
+    top_gaps = sorted(gaps.items(), key=lambda x: x[1], reverse=True)[:3]
+    course_plan = [
+        f"<b>{html.escape(course['name'])}</b> ({html.escape(skill)}) - "
+        f"{html.escape(course['platform'])}, {html.escape(course['duration'])}"
+        for skill, _ in top_gaps for course in ctx['courses'].get(skill, [])
+    ]
+    roadmap = [
+        f"<b>{html.escape(m['Milestone'])}: {html.escape(m['Focus Skill'])}</b> - "
+        f"{html.escape(m['Action'])} <i>{html.escape(m['Recommended Course'])}</i>"
+        for m in app.ROADMAP_DETAILS.get(role, [])
+    ]
+    metric_rows = [f"<tr><th>{name}</th><td>{value:.0f}</td></tr>" for name, value in metrics.items()]
+    metric_rows += [
+        f"<tr><th>Average Salary</th><td>${role_data['avg_salary']:,.0f}</td></tr>",
+        f"<tr><th>Market Demand</th><td>{role_data['demand']}%</td></tr>",
+        f"<tr><th>Growth Rate</th><td>{role_data['growth_rate']}% YoY</td></tr>",
+    ]
+
+    radar_trace = dict(ctx['radar']['trace'], r=list(metrics.values()))
+    timeline_trace = dict(ctx['timeline']['trace'], x=years, y=progression)
+    return REPORT_TEMPLATE.substitute(
+        name=html.escape(student.get('name') or student['student_id']),
+        plotly_version=get_plotlyjs_version(),
+        role=html.escape(role),
+        experience=f"{experience:g}",
+        mentor=html.escape(app.mentor_recommendations(experience)),
+        metrics="".join(metric_rows),
+        gaps=html_list([f"{html.escape(skill)}: improve by {gap} level{'s' if gap > 1 else ''}"
+                        for skill, gap in top_gaps]),
+        courses=html_list(course_plan),
+        roadmap=html_list(roadmap),
+        radar_data=json.dumps([radar_trace], cls=PlotlyJSONEncoder),
+        radar_layout=ctx['radar']['layout'],
+        timeline_data=json.dumps([timeline_trace], cls=PlotlyJSONEncoder),
+        timeline_layout=ctx['timeline']['layout'],
+    )
+
+
+def render_student(student):
+    # Runs in a worker: writes one report and returns (student_id, error).
+    student_id = student['student_id']
+    try:
+        if student.get('target_role') not in _context['roles']:
+            raise ValueError(f"unknown target role {student.get('target_role')!r}")
+        report = render_report(student, _context)
+        path = report_path(_context['out_dir'], student_id)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(report)
+        os.replace(path + ".tmp", path)
+    except Exception as e:
+        return student_id, f"{type(e).__name__}: {e}"
+    return student_id, None
+
+
+# ------------------------
+# Batch Runner
+# ------------------------
+def load_checkpoint(out_dir):
+    try:
+        with open(os.path.join(out_dir, CHECKPOINT_NAME)) as f:
+            return {line.strip() for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+def read_students(path, completed):
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if row.get('student_id') and row['student_id'] not in completed:
+                yield row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render HTML career reports for a cohort of students")
+    parser.add_argument("students", help="CSV file with one student per row")
+    parser.add_argument("--out", default="reports", help="output directory (also holds the checkpoint)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunksize", type=int, default=64)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    completed = load_checkpoint(args.out)
+    if completed:
+        print(f"Resuming: {len(completed)} reports already done.")
+
+    context = build_context(args.out)
+    written = failed = 0
+    start = time.perf_counter()
+    # The checkpoint is line-buffered so an interrupted run loses at most the
+    # reports still in flight; those are simply rendered again on resume.
+    with open(os.path.join(args.out, CHECKPOINT_NAME), "a", buffering=1) as checkpoint, \
+         Pool(args.workers, initializer=init_worker, initargs=(context,)) as pool:
+        for student_id, error in pool.imap_unordered(render_student, read_students(args.students, completed),
+                                                     chunksize=args.chunksize):
+            if error:
+                failed += 1
+                print(f"{student_id}: {error}", file=sys.stderr)
+                continue
+            checkpoint.write(student_id + "\n")
+            written += 1
+            if written % 1000 == 0:
+                print(f"{written} reports ({written / (time.perf_counter() - start):.0f}/s)")
+
+    print(f"Done: {written} reports written, {failed} failed, "
+          f"{len(completed) + written} total in {args.out}.")
+
+
+if __name__ == "__main__":
+    main()
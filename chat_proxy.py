@@ -0,0 +1,497 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+# ------------------------
+# Proxy Configuration
+# ------------------------
+# The browser widget talks to this proxy; only the proxy knows the API key.
+# Point CHAT_BACKEND_URL at a local stand-in (see --stub-backend) for testing.
+BACKEND_URL = os.environ.get(
+    "CHAT_BACKEND_URL",
+    "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:streamGenerateContent?alt=sse",
+)
+API_KEY = os.environ.get("GEMINI_API_KEY", "")
+PROXY_HOST = os.environ.get("CHAT_PROXY_HOST", "127.0.0.1")
+PROXY_PORT = int(os.environ.get("CHAT_PROXY_PORT", "8765"))
+# Browser origins allowed to call the proxy (the Streamlit app); "*" allows any
+ALLOWED_ORIGINS = {o.strip() for o in os.environ.get("CHAT_ALLOWED_ORIGINS", "http://localhost:8501").split(",")
+                   if o.strip()}
+
+POOL_SIZE = 8             # concurrent upstream connections
+POOL_TIMEOUT = 10         # seconds to wait for a free connection before 503
+BACKEND_READ_TIMEOUT = 30  # seconds the backend may go quiet mid-response
+CACHE_ENTRIES = 1024
+CACHE_TTL = 6 * 60 * 60   # seconds
+RATE_PER_MINUTE = 12      # sustained questions per session
+RATE_BURST = 5
+IP_RATE_PER_MINUTE = 60   # per client address, however many sessions it claims
+IP_RATE_BURST = 20
+GLOBAL_RATE_PER_MINUTE = 300
+GLOBAL_RATE_BURST = 50
+MAX_BODY = 16 * 1024
+
+SYSTEM_PROMPT = (
+    "You are a career advisor inside an engineering career navigator. "
+    "Give concise, practical learning recommendations."
+)
+
+
+# ------------------------
+# Response Cache
+# ------------------------
+def normalize_query(text):
+    # Case, punctuation and spacing differences should not miss the cache.
+    text = re.sub(r"[^\w\s]", " ", text.casefold())
+    return " ".join(text.split())
+
+
+class ResponseCache:
+    def __init__(self, max_entries=CACHE_ENTRIES, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] < time.monotonic():
+            del self.entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, value):
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
+
+
+# ------------------------
+# Rate Limiting
+# ------------------------
+class RateLimiter:
+    # Token bucket per key (session, client address, ...); idle keys are
+    # forgotten LRU-first.
+    def __init__(self, rate_per_minute=RATE_PER_MINUTE, burst=RATE_BURST, max_keys=10000):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()
+
+    def check(self, key):
+        # Returns 0 when the request may proceed, otherwise seconds to wait.
+        now = time.monotonic()
+        tokens, last = self.buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        wait = 0 if tokens >= 1 else (1 - tokens) / self.rate
+        if not wait:
+            tokens -= 1
+        self.buckets[key] = (tokens, now)
+        while len(self.buckets) > self.max_keys:
+            self.buckets.popitem(last=False)
+        return wait
+
+
+# ------------------------
+# Minimal HTTP/1.1 Helpers
+# ------------------------
+class BackendError(Exception):
+    pass
+
+
+async def read_headers(reader):
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def iter_body(reader, headers):
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        while True:
+            size_line = await reader.readline()
+            if not size_line.endswith(b"\n"):
+                raise BackendError("backend closed the connection mid-response")
+            try:
+                size = int(size_line.split(b";")[0].strip(), 16)
+            except ValueError:
+                raise BackendError(f"malformed chunk size {size_line[:20]!r}") from None
+            if size == 0:
+                # Trailers, then the blank line that ends the response
+                while True:
+                    line = await reader.readline()
+                    if not line.endswith(b"\n"):
+                        raise BackendError("backend closed the connection mid-response")
+                    if line in (b"\r\n", b"\n"):
+                        return
+            yield await reader.readexactly(size)
+            await reader.readexactly(2)
+    elif "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining:
+            data = await reader.read(min(65536, remaining))
+            if not data:
+                raise BackendError("backend closed the connection mid-response")
+            remaining -= len(data)
+            yield data
+    else:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                return
+            yield data
+
+
+def sse_event(data, event=None):
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n".encode()
+
+
+# ------------------------
+# Backend Connection Pool
+# ------------------------
+class BackendPool:
+    def __init__(self, url=BACKEND_URL, api_key=API_KEY, size=POOL_SIZE):
+        parts = urlsplit(url)
+        self.ssl = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.ssl else 80)
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.api_key = api_key
+        self.slots = asyncio.Semaphore(size)
+        self.idle = []
+
+    async def acquire(self, timeout=POOL_TIMEOUT):
+        await asyncio.wait_for(self.slots.acquire(), timeout)
+        while self.idle:
+            reader, writer = self.idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return (reader, writer), True
+            writer.close()
+        try:
+            conn = await asyncio.open_connection(self.host, self.port, ssl=self.ssl or None)
+        except BaseException:
+            self.slots.release()
+            raise
+        return conn, False
+
+    def release(self, conn, reusable):
+        if reusable:
+            self.idle.append(conn)
+        else:
+            conn[1].close()
+        self.slots.release()
+
+    async def close(self):
+        while self.idle:
+            self.idle.pop()[1].close()
+
+    def _request(self, prompt):
+        body = json.dumps({
+            'systemInstruction': {'parts': [{'text': SYSTEM_PROMPT}]},
+            'contents': [{'role': 'user', 'parts': [{'text': prompt}]}],
+        }).encode()
+        head = (
+            f"POST {self.path} HTTP/1.1\r\n"
+            f"Host: {self.host}\r\n"
+            "Content-Type: application/json\r\n"
+            "Accept: text/event-stream\r\n"
+            f"Content-Length: {len(body)}\r\n"
+        )
+        if self.api_key:
+            head += f"x-goog-api-key: {self.api_key}\r\n"
+        return (head + "\r\n").encode() + body
+
+    async def stream(self, prompt):
+        # Yields text tokens from the backend's SSE stream. A pooled
+        # connection the backend has quietly dropped is retried once, but
+        # only before any token has gone out; a reply is never spliced
+        # together from two attempts.
+        yielded = False
+        for attempt in range(2):
+            conn, pooled = await self.acquire()
+            reader, writer = conn
+            reusable = False
+            try:
+                # Every backend read is bounded, so a stalled upstream cannot
+                # hold a pool slot and the client socket indefinitely.
+                async with asyncio.timeout(BACKEND_READ_TIMEOUT):
+                    writer.write(self._request(prompt))
+                    await writer.drain()
+                    status_line = await reader.readline()
+                if not status_line and pooled and attempt == 0:
+                    continue
+                if not status_line:
+                    raise BackendError("backend closed the connection")
+                status = int(status_line.split()[1])
+                async with asyncio.timeout(BACKEND_READ_TIMEOUT):
+                    headers = await read_headers(reader)
+                body = iter_body(reader, headers)
+                if status != 200:
+                    async with asyncio.timeout(BACKEND_READ_TIMEOUT):
+                        detail = b"".join([chunk async for chunk in body])
+                    raise BackendError(f"backend returned {status}: {detail[:200].decode(errors='replace')}")
+
+                buffer = b""
+                while True:
+                    # Tokens are yielded outside the timeout, so time the
+                    # consumer spends writing to a slow client is not counted.
+                    async with asyncio.timeout(BACKEND_READ_TIMEOUT):
+                        chunk = await anext(body, None)
+                    if chunk is None:
+                        break
+                    buffer += chunk
+                    *lines, buffer = buffer.split(b"\n")
+                    for line in lines:
+                        for token in self._parse_line(line):
+                            yielded = True
+                            yield token
+                for token in self._parse_line(buffer):
+                    yielded = True
+                    yield token
+                framed = "transfer-encoding" in headers or "content-length" in headers
+                reusable = framed and headers.get("connection", "").lower() != "close"
+                return
+            except TimeoutError as e:
+                raise BackendError("backend timed out") from e
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                if pooled and attempt == 0 and not yielded:
+                    continue
+                raise BackendError(str(e)) from e
+            finally:
+                self.release(conn, reusable)
+
+    @staticmethod
+    def _parse_line(line):
+        line = line.strip()
+        if not line.startswith(b"data:"):
+            return
+        try:
+            payload = json.loads(line[5:])
+        except ValueError:
+            return
+        for candidate in payload.get('candidates', [])[:1]:
+            for part in candidate.get('content', {}).get('parts', []):
+                if part.get('text'):
+                    yield part['text']
+
+
+# ------------------------
+# Proxy Server
+# ------------------------
+class ChatProxy:
+    def __init__(self, backend=None, cache=None, session_limiter=None, ip_limiter=None,
+                 global_limiter=None, allowed_origins=ALLOWED_ORIGINS):
+        self.backend = backend or BackendPool()
+        self.cache = cache or ResponseCache()
+        self.allowed_origins = set(allowed_origins)
+        # Checked widest first: session ids are chosen by the client, so they
+        # only share out what the address and global budgets allow.
+        self.limiters = {
+            'global': global_limiter or RateLimiter(GLOBAL_RATE_PER_MINUTE, GLOBAL_RATE_BURST),
+            'ip': ip_limiter or RateLimiter(IP_RATE_PER_MINUTE, IP_RATE_BURST),
+            'session': session_limiter or RateLimiter(),
+        }
+
+    def cors_headers(self, origin):
+        if origin and ("*" in self.allowed_origins or origin in self.allowed_origins):
+            return f"Access-Control-Allow-Origin: {origin}\r\nVary: Origin\r\n"
+        return ""
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = await read_headers(reader)
+            length = int(headers.get("content-length", 0))
+            if length > MAX_BODY:
+                await self.respond(writer, 413, {'error': 'request too large'})
+                return
+            body = await reader.readexactly(length) if length else b""
+            cors = self.cors_headers(headers.get("origin"))
+            peer = (writer.get_extra_info("peername") or ("unknown",))[0]
+
+            if method == "OPTIONS":
+                await self.respond(writer, 204, extra_headers=cors)
+            elif method == "GET" and target == "/stats":
+                await self.respond(writer, 200, self.cache.stats())
+            elif method == "POST" and target == "/chat":
+                if not cors:
+                    await self.respond(writer, 403, {'error': 'origin not allowed'})
+                else:
+                    await self.chat(writer, body, peer, cors)
+            else:
+                await self.respond(writer, 404, {'error': 'not found'})
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload=None, extra_headers=""):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        writer.write((
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            "Access-Control-Allow-Methods: POST, GET, OPTIONS\r\n"
+            "Access-Control-Allow-Headers: Content-Type\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"{extra_headers}"
+            "Connection: close\r\n\r\n"
+        ).encode() + body)
+        await writer.drain()
+
+    async def chat(self, writer, body, peer, cors):
+        try:
+            request = json.loads(body)
+            message = str(request['message'])
+        except (ValueError, KeyError, TypeError):
+            await self.respond(writer, 400, {'error': 'expected JSON with a "message"'}, cors)
+            return
+        role = str(request.get('role') or '')
+        session = str(request.get('session') or 'anonymous')
+
+        for scope, key in (('global', '*'), ('ip', peer), ('session', session)):
+            wait = self.limiters[scope].check(key)
+            if wait:
+                await self.respond(writer, 429, {'error': 'rate limited', 'scope': scope,
+                                                 'retry_after': round(wait, 1)},
+                                   f"{cors}Retry-After: {int(wait) + 1}\r\n")
+                return
+
+        key = (role, normalize_query(message))
+        cached = self.cache.get(key)
+        if cached is not None:
+            await self.start_stream(writer, cors, cached=True)
+            writer.write(sse_event({'token': cached}))
+            writer.write(sse_event({'cached': True}, event="done"))
+            await writer.drain()
+            return
+
+        prompt = f"Target role: {role}\n\n{message}" if role else message
+        tokens = self.backend.stream(prompt)
+        reply = None
+        try:
+            async with contextlib.aclosing(tokens):
+                first = await tokens.__anext__()
+                await self.start_stream(writer, cors, cached=False)
+                reply = [first]
+                writer.write(sse_event({'token': first}))
+                await writer.drain()
+                async for token in tokens:
+                    reply.append(token)
+                    writer.write(sse_event({'token': token}))
+                    await writer.drain()
+        except StopAsyncIteration:
+            await self.respond(writer, 502, {'error': 'empty response from model'}, cors)
+            return
+        except asyncio.TimeoutError:
+            await self.respond(writer, 503, {'error': 'chat backend busy'}, f"{cors}Retry-After: 5\r\n")
+            return
+        except (BackendError, OSError) as e:
+            if reply is not None:
+                writer.write(sse_event({'error': str(e)}, event="error"))
+                await writer.drain()
+            else:
+                await self.respond(writer, 502, {'error': str(e)}, cors)
+            return
+
+        self.cache.put(key, "".join(reply))
+        writer.write(sse_event({'cached': False}, event="done"))
+        await writer.drain()
+
+    async def start_stream(self, writer, cors, cached):
+        writer.write((
+            "HTTP/1.1 200 OK\r\n"
+            f"{cors}"
+            "Content-Type: text/event-stream\r\n"
+            "Cache-Control: no-cache\r\n"
+            f"X-Cache: {'HIT' if cached else 'MISS'}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode())
+        await writer.drain()
+
+
+HTTP_REASONS = {
+    200: "OK", 204: "No Content", 400: "Bad Request", 403: "Forbidden", 404: "Not Found", 413: "Payload Too Large",
+    429: "Too Many Requests", 502: "Bad Gateway", 503: "Service Unavailable",
+}
+
+
+# ------------------------
+# Local Stand-in Model Server
+# ------------------------
+async def stub_backend(reader, writer, delay=0.02):
+    # Speaks just enough of the streamGenerateContent SSE protocol to test the
+    # proxy offline: echoes the question back one word per event.
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            headers = await read_headers(reader)
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            prompt = json.loads(body)['contents'][-1]['parts'][0]['text']
+            words = f"Here is some advice about: {prompt}".split()
+
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                         b"Transfer-Encoding: chunked\r\n\r\n")
+            for i, word in enumerate(words):
+                event = {'candidates': [{'content': {'parts': [{'text': word if i == 0 else " " + word}]}}]}
+                data = f"data: {json.dumps(event)}\r\n\r\n".encode()
+                writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                await writer.drain()
+                await asyncio.sleep(delay)
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host=PROXY_HOST, port=PROXY_PORT, backend_url=BACKEND_URL):
+    proxy = ChatProxy(BackendPool(backend_url))
+    server = await asyncio.start_server(proxy.handle, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+async def serve_stub(host, port):
+    server = await asyncio.start_server(stub_backend, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Learning Path chatbot proxy")
+    parser.add_argument("--host", default=PROXY_HOST)
+    parser.add_argument("--port", type=int, default=PROXY_PORT)
+    parser.add_argument("--backend", default=BACKEND_URL)
+    parser.add_argument("--stub-backend", action="store_true",
+                        help="run the local stand-in model server instead of the proxy")
+    args = parser.parse_args()
+    if args.stub_backend:
+        asyncio.run(serve_stub(args.host, args.port))
+    else:
+        asyncio.run(serve(args.host, args.port, args.backend))
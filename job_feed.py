@@ -0,0 +1,280 @@
+import glob
+import json
+import logging
+import math
+import os
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timezone
+
+import pandas as pd
+
+# ------------------------
+# Feed Configuration
+# ------------------------
+# Job postings are dropped into this directory as append-only JSONL files
+# (one posting per line) or as immutable Parquet files. Each posting needs
+# at least a 'role' and a 'salary'; 'posted_at' (ISO date) drives growth.
+FEED_DIR = os.environ.get("JOB_FEED_DIR", os.path.join("data", "job_feed"))
+QUANTILES = (0.25, 0.5, 0.75)
+FEED_COLUMNS = ("role", "salary", "posted_at")
+
+logger = logging.getLogger(__name__)
+
+
+def posting_period(posted_at):
+    # 'YYYY-MM' bucket for a posting date, or None if it is not a date.
+    if isinstance(posted_at, str):
+        try:
+            posted_at = datetime.fromisoformat(posted_at.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if isinstance(posted_at, (date, datetime)):
+        try:
+            return f"{posted_at.year:04d}-{posted_at.month:02d}"
+        except (TypeError, ValueError):
+            # pandas NaT is a datetime without a year
+            return None
+    return None
+
+
+def last_complete_month(now=None):
+    # The current month is still filling up, so growth and demand are
+    # measured on the month before it.
+    now = now or datetime.now(timezone.utc)
+    year, month = (now.year, now.month - 1) if now.month > 1 else (now.year - 1, 12)
+    return f"{year:04d}-{month:02d}"
+
+
+# ------------------------
+# Streaming Statistics
+# ------------------------
+class P2Quantile:
+    # P-square estimator (Jain & Chlamtac): tracks one quantile in O(1)
+    # memory without keeping the observed values around.
+    def __init__(self, q):
+        self.q = q
+        self.initial = []
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self.increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def add(self, x):
+        if len(self.initial) < 5:
+            self.initial.append(x)
+            if len(self.initial) == 5:
+                self.heights = sorted(self.initial)
+            return
+
+        h = self.heights
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= h[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            self.positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in range(1, 4):
+            d = self.desired[i] - self.positions[i]
+            if (d >= 1 and self.positions[i + 1] - self.positions[i] > 1) or \
+               (d <= -1 and self.positions[i - 1] - self.positions[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not h[i - 1] < candidate < h[i + 1]:
+                    candidate = self._linear(i, step)
+                h[i] = candidate
+                self.positions[i] += step
+
+    def _parabolic(self, i, d):
+        h, n = self.heights, self.positions
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i, d):
+        h, n = self.heights, self.positions
+        return h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+
+    def value(self):
+        if self.heights:
+            return self.heights[2]
+        if not self.initial:
+            return float("nan")
+        ordered = sorted(self.initial)
+        return ordered[min(len(ordered) - 1, int(round(self.q * (len(ordered) - 1))))]
+
+
+class RoleAggregate:
+    # Running per-role statistics, updated one posting at a time.
+    def __init__(self):
+        self.count = 0
+        self.salary_mean = 0.0
+        self.salary_quantiles = {q: P2Quantile(q) for q in QUANTILES}
+        self.monthly_postings = defaultdict(int)
+
+    def add(self, salary, period):
+        self.count += 1
+        self.salary_mean += (salary - self.salary_mean) / self.count
+        for estimator in self.salary_quantiles.values():
+            estimator.add(salary)
+        if period:
+            self.monthly_postings[period] += 1
+
+    def growth_rate(self, period):
+        # Year-over-year change in posting volume for a complete month, to
+        # match the baseline 'growth_rate' (% YoY).
+        year, month = period.split("-")
+        previous = self.monthly_postings.get(f"{int(year) - 1:04d}-{month}", 0)
+        if not previous:
+            return None
+        latest = self.monthly_postings.get(period, 0)
+        return round((latest - previous) / previous * 100)
+
+
+# ------------------------
+# Incremental Feed Reader
+# ------------------------
+class JobFeed:
+    def __init__(self, feed_dir=FEED_DIR):
+        self.feed_dir = feed_dir
+        self.offsets = {}
+        self.seen_parquet = set()
+        self.failed_parquet = {}
+        self.aggregates = defaultdict(RoleAggregate)
+        self.lock = threading.Lock()
+
+    def poll(self):
+        # Read only what was appended since the last poll; returns the
+        # number of postings ingested.
+        with self.lock:
+            ingested = 0
+            for path in sorted(glob.glob(os.path.join(self.feed_dir, "*.jsonl"))):
+                ingested += self._read_jsonl(path)
+            for path in sorted(glob.glob(os.path.join(self.feed_dir, "*.parquet"))):
+                if path in self.seen_parquet:
+                    continue
+                stat = os.stat(path)
+                if self.failed_parquet.get(path) == (stat.st_mtime, stat.st_size):
+                    continue
+                ingested += self._read_parquet(path, stat)
+            return ingested
+
+    def _read_jsonl(self, path):
+        offset = self.offsets.get(path, 0)
+        size = os.path.getsize(path)
+        if size < offset:
+            # File was replaced rather than appended to; start over.
+            offset = 0
+        if size == offset:
+            return 0
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read(size - offset)
+
+        # Leave a partially written trailing line for the next poll.
+        end = chunk.rfind(b"\n")
+        if end == -1:
+            return 0
+        self.offsets[path] = offset + end + 1
+
+        ingested = 0
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            ingested += self._ingest(record)
+        return ingested
+
+    def _read_parquet(self, path, stat):
+        try:
+            import pyarrow
+            import pyarrow.parquet as pq
+        except ImportError:
+            # No Parquet engine installed; keep the drop for a later poll.
+            return 0
+        try:
+            parquet = pq.ParquetFile(path)
+            columns = [c for c in FEED_COLUMNS if c in parquet.schema_arrow.names]
+            frame = parquet.read(columns=columns).to_pandas()
+        except (OSError, ValueError, pyarrow.ArrowException) as e:
+            # Unreadable, or still being copied in: retry once the file changes.
+            logger.warning("Skipping job feed drop %s: %s", path, e)
+            self.failed_parquet[path] = (stat.st_mtime, stat.st_size)
+            return 0
+        self.seen_parquet.add(path)
+        self.failed_parquet.pop(path, None)
+        ingested = 0
+        for record in frame.to_dict("records"):
+            ingested += self._ingest(record)
+        return ingested
+
+    def _ingest(self, record):
+        if not isinstance(record, dict):
+            return 0
+        role = record.get("role")
+        try:
+            salary = float(record.get("salary"))
+        except (TypeError, ValueError):
+            return 0
+        if not isinstance(role, str) or not role or not math.isfinite(salary):
+            return 0
+        self.aggregates[role].add(salary, posting_period(record.get("posted_at")))
+        return 1
+
+    def snapshot(self, period=None):
+        # Current aggregates as a frame shaped like the 'job_data' table.
+        # 'demand_index' is each role's posting volume in the last complete
+        # month relative to the busiest role (0-100).
+        period = period or last_complete_month()
+        with self.lock:
+            volumes = {role: agg.monthly_postings.get(period, 0) for role, agg in self.aggregates.items()}
+            busiest = max(volumes.values(), default=0)
+            rows = []
+            for role, agg in self.aggregates.items():
+                quantiles = {q: est.value() for q, est in agg.salary_quantiles.items()}
+                rows.append({
+                    'role': role,
+                    'avg_salary': round(agg.salary_mean),
+                    'growth_rate': agg.growth_rate(period),
+                    'demand_index': round(100 * volumes[role] / busiest) if busiest else None,
+                    'salary_p25': round(quantiles[0.25]),
+                    'salary_median': round(quantiles[0.5]),
+                    'salary_p75': round(quantiles[0.75]),
+                    'postings': agg.count,
+                })
+        return pd.DataFrame(rows, columns=['role', 'avg_salary', 'growth_rate', 'demand_index',
+                                           'salary_p25', 'salary_median', 'salary_p75', 'postings'])
+
+
+def live_job_data(job_data, feed):
+    # Overlay live aggregates on the baseline table. Roles without postings,
+    # and metrics the feed cannot estimate yet, keep their baseline values.
+    # The relative demand index only replaces 'demand' once the feed covers
+    # every role, so live and static values never share the column.
+    feed.poll()
+    baseline = job_data.set_index('role')
+    live = feed.snapshot().set_index('role').reindex(baseline.index)
+    if live['postings'].notna().all() and live['demand_index'].notna().all():
+        live['demand'] = live['demand_index']
+    merged = live.combine_first(baseline)
+    for column in ('avg_salary', 'growth_rate', 'demand'):
+        merged[column] = merged[column].round().astype(int)
+    for column in ('demand_index', 'salary_p25', 'salary_median', 'salary_p75', 'postings'):
+        merged[column] = merged[column].astype('Int64')
+    columns = list(job_data.columns) + [c for c in live.columns if c not in job_data.columns]
+    return merged.reset_index()[columns]
@@ -0,0 +1,335 @@
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+# ------------------------
+# Harness Configuration
+# ------------------------
+# Drives N simulated browser sessions against one in-process copy of app.py,
+# sharing st.cache_data / st.cache_resource the way one Streamlit worker does.
+#
+# Concurrency model: AppTest swaps the process-global Runtime instance and
+# config options on every run, so two runs must never overlap. Sessions
+# therefore think and queue concurrently, but their reruns go through the
+# script one at a time (RUN_LOCK), as a single server. A worker's reruns
+# are mostly Python (pandas, plotly, scikit-learn) and share one GIL, so
+# this models where it saturates. Work that releases the GIL (socket I/O,
+# some numpy) would overlap in a real worker, so treat the results as a
+# lower bound. Latency = queueing wait + service time; both are reported.
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(APP_DIR, "app.py")
+RERUN_TIMEOUT = 120
+RUN_LOCK = threading.Lock()
+
+ROLES = ['Data Engineer', 'AI Specialist', 'Cloud Architect', 'Data Scientist', 'DevOps Engineer',
+         'Cybersecurity Analyst', 'Full-Stack Developer', 'Product Manager']
+
+
+# ------------------------
+# Widget Helpers
+# ------------------------
+def find(widgets, label):
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    raise LookupError(f"no widget labelled {label!r}")
+
+
+def navigate(at, page):
+    return at.sidebar.radio[0].set_value(page).run()
+
+
+# ------------------------
+# User Journeys
+# ------------------------
+# Each journey takes (at, rng, step); step(name, action) times one rerun.
+def home_journey(at, rng, step):
+    step("home", lambda: navigate(at, "🏠 Home"))
+
+
+def career_predictor_journey(at, rng, step):
+    step("predictor: open", lambda: navigate(at, "🎯 Career Predictor"))
+    find(at.selectbox, "Highest Degree").set_value(rng.choice(["Bachelor's", "Master's", "PhD"]))
+    find(at.slider, "Years of Experience").set_value(rng.randint(0, 30))
+    find(at.selectbox, "Target Role").set_value(rng.choice(ROLES))
+    for label in ("Python", "Machine Learning", "Cloud Computing"):
+        find(at.slider, label).set_value(rng.randint(1, 5))
+    step("predictor: submit", lambda: find(at.button, "🚀 Analyze Career Potential").click().run())
+    # Re-submit so the extra skill sliders for the chosen role are filled in
+    for slider in at.slider:
+        if slider.label not in ("Years of Experience", "Projection Years"):
+            slider.set_value(rng.randint(1, 5))
+    step("predictor: resubmit", lambda: find(at.button, "🚀 Analyze Career Potential").click().run())
+    if any(s.label == "Projection Years" for s in at.slider):
+        step("predictor: projection", lambda: find(at.slider, "Projection Years").set_value(rng.randint(1, 30)).run())
+
+
+def learning_path_journey(at, rng, step):
+    step("learning: open", lambda: navigate(at, "📚 Learning Path"))
+    step("learning: role", lambda: find(at.selectbox, "Select Target Role").set_value(rng.choice(ROLES)).run())
+    step("learning: timeline", lambda: find(at.slider, "Select your desired timeline (in months)")
+         .set_value(rng.randint(6, 36)).run())
+    focus = rng.sample(["Technical Skills", "Soft Skills", "Certifications"], rng.randint(1, 3))
+    step("learning: focus", lambda: find(at.multiselect, "Select focus areas").set_value(focus).run())
+
+
+def job_market_journey(at, rng, step):
+    step("job market", lambda: navigate(at, "📊 Job Market Insights"))
+
+
+def interview_journey(at, rng, step):
+    step("interview: open", lambda: navigate(at, "💬 Interview Simulator"))
+    find(at.selectbox, "Select a Role for Interview Simulation").set_value(rng.choice(ROLES))
+    step("interview: generate", lambda: find(at.button, "Generate Interview Questions").click().run())
+
+
+def skill_network_journey(at, rng, step):
+    step("skill network", lambda: navigate(at, "🔗 Skill Network"))
+
+
+def career_news_journey(at, rng, step):
+    step("news: open", lambda: navigate(at, "📰 Career News"))
+    if len(at.number_input):
+        page = at.number_input[0]
+        step("news: page", lambda: page.set_value(rng.randint(1, int(page.max_value or 1))).run())
+
+
+JOURNEYS = [
+    home_journey,
+    career_predictor_journey,
+    learning_path_journey,
+    job_market_journey,
+    interview_journey,
+    skill_network_journey,
+    career_news_journey,
+]
+
+
+# ------------------------
+# Measurements
+# ------------------------
+def instrument_caches():
+    # Counts hits and misses on every st.cache_data / st.cache_resource
+    # lookup, keyed by the cached function's name. These are Streamlit
+    # internals, so report nothing rather than fail if they move.
+    counters = defaultdict(lambda: [0, 0])
+    lock = threading.Lock()
+    try:
+        from streamlit.runtime.caching.cache_data_api import DataCache
+        from streamlit.runtime.caching.cache_resource_api import ResourceCache
+        from streamlit.runtime.caching.cache_utils import CachedFunc
+    except ImportError:
+        return None
+    if not hasattr(CachedFunc, "_handle_cache_miss"):
+        return None
+
+    # On a miss, CachedFunc re-reads the cache under the value lock
+    # (double-checked locking). Only the first, unlocked read decides hit or
+    # miss, so reads made inside _handle_cache_miss are not counted.
+    in_miss = threading.local()
+    handle_cache_miss = CachedFunc._handle_cache_miss
+
+    def counted_handle_cache_miss(self, *args, **kwargs):
+        in_miss.active = True
+        try:
+            return handle_cache_miss(self, *args, **kwargs)
+        finally:
+            in_miss.active = False
+
+    CachedFunc._handle_cache_miss = counted_handle_cache_miss
+
+    for cache_cls in (DataCache, ResourceCache):
+        original = cache_cls.read_result
+
+        def read_result(self, key, _original=original):
+            if getattr(in_miss, 'active', False):
+                return _original(self, key)
+            name = getattr(self, 'display_name', type(self).__name__)
+            try:
+                result = _original(self, key)
+            except Exception:
+                with lock:
+                    counters[name][1] += 1
+                raise
+            with lock:
+                counters[name][0] += 1
+            return result
+
+        cache_cls.read_result = read_result
+    return counters
+
+
+def percentiles(values):
+    if not values:
+        return {'p50': float('nan'), 'p95': float('nan'), 'p99': float('nan')}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {'p50': p50, 'p95': p95, 'p99': p99}
+
+
+# ------------------------
+# Load Runner
+# ------------------------
+def run_session(session_id, rounds, seed, think_time, stats, sessions):
+    rng = random.Random(seed + session_id)
+    at = AppTest.from_file(APP_PATH, default_timeout=RERUN_TIMEOUT)
+    sessions.append(at)
+
+    def step(name, action):
+        queued = time.perf_counter()
+        with RUN_LOCK:
+            started = time.perf_counter()
+            try:
+                action()
+            except Exception as e:
+                stats['errors'].append(f"{name}: {type(e).__name__}: {e}")
+                return
+            finished = time.perf_counter()
+            for exc in at.exception:
+                stats['errors'].append(f"{name}: {exc.message}")
+        stats['latency'][name].append(finished - queued)
+        stats['service'].append(finished - started)
+        if think_time:
+            time.sleep(rng.expovariate(1 / think_time))
+
+    step("first load", at.run)
+    for _ in range(rounds):
+        journeys = JOURNEYS[:]
+        rng.shuffle(journeys)
+        for journey in journeys:
+            try:
+                journey(at, rng, step)
+            except LookupError as e:
+                stats['errors'].append(f"{journey.__name__}: {e}")
+
+
+def new_stats():
+    return {'latency': defaultdict(list), 'service': [], 'errors': []}
+
+
+def run_level(n_sessions, rounds, seed, think_time):
+    stats = new_stats()
+    sessions = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_sessions) as pool:
+        futures = [pool.submit(run_session, i, rounds, seed, think_time, stats, sessions)
+                   for i in range(n_sessions)]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    latencies = stats['latency']
+    all_latencies = [t for values in latencies.values() for t in values]
+    return {
+        'sessions': n_sessions,
+        'reruns': len(all_latencies),
+        'elapsed_s': elapsed,
+        'throughput_rps': len(all_latencies) / elapsed if elapsed else 0,
+        'latency_s': percentiles(all_latencies),
+        'service_s': percentiles(stats['service']),
+        'utilization': sum(stats['service']) / elapsed if elapsed else 0,
+        'steps': {name: percentiles(values) for name, values in sorted(latencies.items())},
+        'errors': stats['errors'],
+    }
+
+
+def warm_up(rounds, seed):
+    # One full tour so imports, data generation and shared caches are loaded
+    # before anything is measured.
+    run_session(-1, rounds, seed, 0, new_stats(), [])
+    gc.collect()
+
+
+def session_memory_mb(n_sessions, rounds, seed):
+    # Python-level allocations retained per live session, on top of the
+    # warmed-up baseline. Measured in a separate pass so tracemalloc's
+    # overhead does not skew the latency numbers.
+    sessions = []
+    tracemalloc.start()
+    try:
+        gc.collect()
+        baseline = tracemalloc.get_traced_memory()[0]
+        for i in range(n_sessions):
+            run_session(i, rounds, seed, 0, new_stats(), sessions)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    return retained / n_sessions / 2 ** 20
+
+
+def print_report(results, memory_mb, cache_counters):
+    print(f"{'sessions':>8} {'reruns':>7} {'rerun/s':>8} {'util':>6} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'svc p95':>8} {'errors':>6}")
+    for r in results:
+        lat = r['latency_s']
+        print(f"{r['sessions']:>8} {r['reruns']:>7} {r['throughput_rps']:>8.2f} {r['utilization']:>6.0%} "
+              f"{lat['p50'] * 1000:>8.0f} {lat['p95'] * 1000:>8.0f} {lat['p99'] * 1000:>8.0f} "
+              f"{r['service_s']['p95'] * 1000:>8.0f} {len(r['errors']):>6}")
+    print("(latency includes queueing for the serialized script; 'svc' is time running it)")
+
+    busiest = results[-1]
+    print(f"\nPer-step p95 latency at {busiest['sessions']} sessions:")
+    for name, lat in busiest['steps'].items():
+        print(f"  {name:<24} {lat['p95'] * 1000:>8.0f} ms")
+
+    print(f"\nMemory retained per session (over warmed-up baseline): {memory_mb:.1f} MB")
+
+    if cache_counters is None:
+        print("\nCache hit rates unavailable for this Streamlit version.")
+    else:
+        print("\nCache lookups (measured levels, after warm-up):")
+        for name, (hits, misses) in sorted(cache_counters.items()):
+            total = hits + misses
+            print(f"  {name:<40} {hits:>6}/{total:<6} hits ({hits / total:.0%})")
+
+    for r in results:
+        for error in r['errors'][:5]:
+            print(f"[{r['sessions']} sessions] {error}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Concurrent-session load test for app.py (reruns are serialized; see module comments)")
+    parser.add_argument("--sessions", default="1,2,4,8",
+                        help="comma-separated concurrency levels to run in turn")
+    parser.add_argument("--rounds", type=int, default=2,
+                        help="passes through every page journey per session")
+    parser.add_argument("--think-time", type=float, default=1.0,
+                        help="mean seconds a user pauses between interactions (0 for back-to-back)")
+    parser.add_argument("--memory-sessions", type=int, default=4,
+                        help="sessions to hold open when measuring memory per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the raw results to this file")
+    args = parser.parse_args()
+
+    # Resolve style.css, feeds and sibling modules the way `streamlit run` would
+    os.chdir(APP_DIR)
+    sys.path.insert(0, APP_DIR)
+
+    cache_counters = instrument_caches()
+    warm_up(1, args.seed)
+    memory_mb = session_memory_mb(args.memory_sessions, 1, args.seed)
+    if cache_counters is not None:
+        cache_counters.clear()
+
+    results = [run_level(int(n), args.rounds, args.seed, args.think_time) for n in args.sessions.split(",")]
+    print_report(results, memory_mb, cache_counters)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({'levels': results, 'mb_per_session': memory_mb, 'caches': dict(cache_counters or {})},
+                      f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# ------------------------
+# News Configuration
+# ------------------------
+# Sources are RSS/Atom or JSON feeds, given as http(s) URLs or local paths,
+# one per line in NEWS_SOURCES_FILE or comma-separated in NEWS_SOURCES.
+NEWS_SOURCES_FILE = os.environ.get("NEWS_SOURCES_FILE", os.path.join("data", "news_sources.txt"))
+NEWS_INDEX_PATH = os.environ.get("NEWS_INDEX_PATH", os.path.join("data", "news_index.json"))
+REFRESH_INTERVAL = 15 * 60   # seconds between background refreshes
+FETCH_TIMEOUT = 10
+MAX_CONCURRENT_FETCHES = 16
+MAX_ARTICLES = 500
+PAGE_SIZE = 10
+
+# Plain-language phrases that should also tag a skill
+SKILL_ALIASES = {
+    'ML': ['machine learning'],
+    'Cloud': ['aws', 'azure', 'gcp'],
+    'Security': ['cybersecurity', 'cyber'],
+    'CI/CD': ['continuous integration', 'continuous delivery'],
+    'Agile': ['scrum'],
+}
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+logger = logging.getLogger(__name__)
+
+
+def load_sources():
+    if os.environ.get("NEWS_SOURCES"):
+        return [s.strip() for s in os.environ["NEWS_SOURCES"].split(",") if s.strip()]
+    try:
+        with open(NEWS_SOURCES_FILE) as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    except FileNotFoundError:
+        return []
+
+
+# ------------------------
+# Feed Parsing
+# ------------------------
+def parse_date(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # Some JSON feeds publish Unix timestamps
+        try:
+            return datetime.fromtimestamp(value, timezone.utc).isoformat()
+        except (OverflowError, OSError, ValueError):
+            return None
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    # Always UTC, so the ISO strings sort chronologically across feeds
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def text_field(item, *keys):
+    # First non-empty scalar among keys, as a string; JSON feeds are loose
+    # about types.
+    for key in keys:
+        value = item.get(key)
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool) and value != "":
+            return str(value)
+    return ""
+
+
+def parse_feed(body):
+    # Returns a list of {'headline', 'link', 'summary', 'published'} dicts
+    # from an RSS 2.0, Atom, JSON Feed or plain JSON list payload.
+    text = body.decode("utf-8", errors="replace").lstrip()
+    if text.startswith(("{", "[")):
+        data = json.loads(text)
+        items = data.get('items', []) if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return []
+        return [{
+            'headline': text_field(item, 'title', 'headline'),
+            'link': text_field(item, 'url', 'link'),
+            'summary': text_field(item, 'content_text', 'summary'),
+            'published': parse_date(item.get('date_published') or item.get('published')),
+        } for item in items if isinstance(item, dict)]
+
+    root = ET.fromstring(text)
+    articles = []
+    for item in root.iter("item"):
+        articles.append({
+            'headline': item.findtext("title", ""),
+            'link': item.findtext("link", ""),
+            'summary': item.findtext("description", ""),
+            'published': parse_date(item.findtext("pubDate")),
+        })
+    for entry in root.iter(f"{ATOM}entry"):
+        link = entry.find(f"{ATOM}link")
+        articles.append({
+            'headline': entry.findtext(f"{ATOM}title", ""),
+            'link': link.get("href", "") if link is not None else "",
+            'summary': entry.findtext(f"{ATOM}summary", ""),
+            'published': parse_date(entry.findtext(f"{ATOM}updated") or entry.findtext(f"{ATOM}published")),
+        })
+    return articles
+
+
+def content_hash(article):
+    # Syndicated copies of a story differ in links and markup, not wording.
+    text = re.sub(r"<[^>]+>", " ", f"{article['headline']} {article['summary']}").casefold()
+    return hashlib.sha1(" ".join(re.findall(r"\w+", text)).encode()).hexdigest()
+
+
+# ------------------------
+# Relevance Tagging
+# ------------------------
+def build_skill_patterns(roles):
+    skills = sorted({skill for required in roles.values() for skill in required})
+    return {
+        skill: re.compile(r"\b(" + "|".join(re.escape(term) for term in [skill] + SKILL_ALIASES.get(skill, [])) + r")\b",
+                          re.IGNORECASE)
+        for skill in skills
+    }
+
+
+def tag_article(article, roles, skill_patterns):
+    text = f"{article['headline']} {article['summary']}"
+    skills = [skill for skill, pattern in skill_patterns.items() if pattern.search(text)]
+    scores = {role: sum(required.get(skill, 0) for skill in skills) for role, required in roles.items()}
+    matched_roles = sorted((role for role, score in scores.items() if score), key=lambda r: -scores[r])
+    article['skills'] = skills
+    article['roles'] = matched_roles[:3]
+    article['relevance'] = max(scores.values(), default=0)
+    return article
+
+
+# ------------------------
+# Rendering
+# ------------------------
+def order_articles(articles):
+    return sorted(articles.values(), key=lambda a: a['published'] or "", reverse=True)
+
+
+def render_pages(articles, page_size=PAGE_SIZE):
+    pages = []
+    for start in range(0, len(articles), page_size):
+        blocks = []
+        for article in articles[start:start + page_size]:
+            headline = article['headline'].replace("[", "\\[").replace("]", "\\]")
+            block = f"[{headline}]({article['link']})"
+            if article.get('roles'):
+                block += f"  \n*Relevant for:* {', '.join(article['roles'])}"
+            blocks.append(block)
+        pages.append("\n\n---\n\n".join(blocks) + "\n\n---")
+    return pages
+
+
+# ------------------------
+# Aggregator
+# ------------------------
+class NewsAggregator:
+    def __init__(self, roles, sources=None, index_path=NEWS_INDEX_PATH):
+        self.roles = roles
+        self.skill_patterns = build_skill_patterns(roles)
+        self.sources = load_sources() if sources is None else sources
+        self.index_path = index_path
+        self.lock = threading.Lock()
+        self.refreshing = False
+        self.fetched_at = 0
+        self.validators = {}
+        self.articles = {}
+        self.pages = []
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        self.fetched_at = index.get('fetched_at', 0)
+        self.validators = index.get('validators', {})
+        self.articles = {a['hash']: a for a in index.get('articles', [])}
+        for article in self.articles.values():
+            # Indexes written before dates were normalised to UTC
+            article['published'] = parse_date(article['published']) or article['published']
+        self.pages = render_pages(order_articles(self.articles))
+
+    def _save(self, fetched_at, validators, ordered):
+        os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({'fetched_at': fetched_at, 'validators': validators, 'articles': ordered}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def refresh_in_background(self):
+        # Called on every page view; never waits on the network.
+        with self.lock:
+            if not self.sources or self.refreshing or time.time() - self.fetched_at < REFRESH_INTERVAL:
+                return
+            self.refreshing = True
+        threading.Thread(target=lambda: asyncio.run(self.refresh()), daemon=True).start()
+
+    async def refresh(self):
+        try:
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+            results = await asyncio.gather(*(self._fetch(source, semaphore) for source in self.sources),
+                                           return_exceptions=True)
+            # This is the only writer (see self.refreshing), so work on copies
+            # and hold the lock just long enough to swap the results in.
+            articles = dict(self.articles)
+            validators = dict(self.validators)
+            seen_at = datetime.now(timezone.utc).isoformat()
+            for source, result in zip(self.sources, results):
+                if isinstance(result, Exception):
+                    logger.warning("Fetching news source %s failed: %s", source, result)
+                    continue
+                if result is None:
+                    continue
+                body, source_validators = result
+                try:
+                    articles.update(self._new_articles(body, articles, seen_at))
+                except Exception as e:
+                    logger.warning("Skipping news source %s: %s", source, e)
+                    continue
+                validators[source] = source_validators
+
+            ordered = order_articles(articles)[:MAX_ARTICLES]
+            pages = render_pages(ordered)
+            fetched_at = time.time()
+            with self.lock:
+                self.articles = {a['hash']: a for a in ordered}
+                self.validators = validators
+                self.pages = pages
+                self.fetched_at = fetched_at
+            self._save(fetched_at, validators, ordered)
+        finally:
+            self.refreshing = False
+
+    def _new_articles(self, body, known, seen_at):
+        fresh = {}
+        for article in parse_feed(body):
+            if not article['headline'] or not article['link']:
+                continue
+            key = content_hash(article)
+            if key not in known and key not in fresh:
+                article['hash'] = key
+                article['published'] = article['published'] or seen_at
+                fresh[key] = tag_article(article, self.roles, self.skill_patterns)
+        return fresh
+
+    async def _fetch(self, source, semaphore):
+        # Returns (body, validators), or None when the source is unchanged.
+        async with semaphore:
+            return await asyncio.to_thread(self._fetch_sync, source, self.validators.get(source, {}))
+
+    @staticmethod
+    def _fetch_sync(source, validators):
+        parts = urlsplit(source)
+        if parts.scheme not in ("http", "https"):
+            path = parts.path if parts.scheme == "file" else source
+            mtime = os.stat(path).st_mtime
+            if validators.get('mtime') == mtime:
+                return None
+            with open(path, "rb") as f:
+                return f.read(), {'mtime': mtime}
+
+        request = urllib.request.Request(source, headers={'User-Agent': 'career-navigator-news/1.0'})
+        if validators.get('etag'):
+            request.add_header('If-None-Match', validators['etag'])
+        if validators.get('last_modified'):
+            request.add_header('If-Modified-Since', validators['last_modified'])
+        try:
+            with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+                return response.read(), {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                }
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None
+            raise
+
+    def get_pages(self):
+        with self.lock:
+            return list(self.pages)
@@ -0,0 +1,248 @@
+import asyncio
+import json
+
+import pytest
+
+import chat_proxy
+from chat_proxy import ChatProxy, BackendError, BackendPool, RateLimiter, ResponseCache, iter_body
+
+ORIGIN = "http://localhost:8501"
+
+
+# ------------------------
+# Helpers
+# ------------------------
+async def start_proxy(backend_handler=None, **proxy_kwargs):
+    # Proxy wired to the local stand-in model server (or backend_handler) on
+    # ephemeral ports.
+    connections = []
+
+    async def backend(reader, writer):
+        connections.append(writer)
+        if backend_handler:
+            await backend_handler(reader, writer)
+        else:
+            await chat_proxy.stub_backend(reader, writer, delay=0)
+
+    stub = await asyncio.start_server(backend, "127.0.0.1", 0)
+    stub_port = stub.sockets[0].getsockname()[1]
+    proxy = ChatProxy(BackendPool(f"http://127.0.0.1:{stub_port}/v1beta/models/stub:streamGenerateContent?alt=sse",
+                                  api_key="test-key", size=2),
+                      allowed_origins=[ORIGIN], **proxy_kwargs)
+    server = await asyncio.start_server(proxy.handle, "127.0.0.1", 0)
+    return proxy, server, stub, connections
+
+
+async def stop(proxy, *servers):
+    await proxy.backend.close()
+    for server in servers:
+        server.close()
+        await server.wait_closed()
+
+
+async def post_chat(server, message, session="s1", role="Data Engineer", origin=ORIGIN):
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps({'message': message, 'role': role, 'session': session}).encode()
+    head = f"POST /chat HTTP/1.1\r\nHost: proxy\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+    if origin:
+        head += f"Origin: {origin}\r\n"
+    writer.write((head + "\r\n").encode() + body)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+
+    head, _, payload = raw.decode().partition("\r\n\r\n")
+    status_line, *header_lines = head.split("\r\n")
+    headers = {k.lower(): v.strip() for k, _, v in (line.partition(":") for line in header_lines)}
+    events = []
+    if headers.get("content-type") == "text/event-stream":
+        for block in payload.split("\n\n"):
+            lines = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+            if "data" in lines:
+                events.append((lines.get("event", "message"), json.loads(lines["data"])))
+    else:
+        events = json.loads(payload) if payload else None
+    return int(status_line.split()[1]), headers, events
+
+
+def reply_text(events):
+    return "".join(data['token'] for event, data in events if event == "message")
+
+
+# ------------------------
+# Tests
+# ------------------------
+def test_streams_tokens_and_caches_normalized_repeats():
+    async def scenario():
+        proxy, server, stub, connections = await start_proxy()
+        try:
+            status, headers, events = await post_chat(server, "How do I learn SQL?")
+            assert status == 200
+            assert headers['x-cache'] == "MISS"
+            assert headers['access-control-allow-origin'] == ORIGIN
+            assert len(events) > 2
+            assert reply_text(events) == "Here is some advice about: Target role: Data Engineer How do I learn SQL?"
+            assert events[-1] == ("done", {'cached': False})
+
+            status, headers, repeat = await post_chat(server, "  how do i LEARN sql ")
+            assert status == 200
+            assert headers['x-cache'] == "HIT"
+            assert reply_text(repeat) == reply_text(events)
+
+            # A different role is a different question
+            _, headers, _ = await post_chat(server, "How do I learn SQL?", role="Data Scientist")
+            assert headers['x-cache'] == "MISS"
+
+            # Both misses went over one kept-alive backend connection
+            assert len(connections) == 1
+            assert proxy.cache.stats() == {'entries': 2, 'hits': 1, 'misses': 2}
+        finally:
+            await stop(proxy, server, stub)
+
+    asyncio.run(scenario())
+
+
+def test_rate_limits_sessions_and_addresses():
+    async def scenario():
+        proxy, server, stub, _ = await start_proxy(session_limiter=RateLimiter(1, 2),
+                                                   ip_limiter=RateLimiter(1, 4))
+        try:
+            assert (await post_chat(server, "q1"))[0] == 200
+            assert (await post_chat(server, "q2"))[0] == 200
+            status, headers, body = await post_chat(server, "q3")
+            assert status == 429
+            assert body['scope'] == "session"
+            assert int(headers['retry-after']) >= 1
+
+            # Rotating session ids still runs into the per-address budget
+            assert (await post_chat(server, "q4", session="s2"))[0] == 200
+            status, _, body = await post_chat(server, "q5", session="s3")
+            assert status == 429
+            assert body['scope'] == "ip"
+        finally:
+            await stop(proxy, server, stub)
+
+    asyncio.run(scenario())
+
+
+def test_rejects_other_origins():
+    async def scenario():
+        proxy, server, stub, connections = await start_proxy()
+        try:
+            for origin in ("https://evil.example", None):
+                status, headers, _ = await post_chat(server, "q", origin=origin)
+                assert status == 403
+                assert 'access-control-allow-origin' not in headers
+            assert connections == []
+        finally:
+            await stop(proxy, server, stub)
+
+    asyncio.run(scenario())
+
+
+def test_backend_dying_mid_reply_is_not_retried_or_cached():
+    async def flaky_backend(reader, writer):
+        # Answers the first request in full, then drops the kept-alive
+        # connection halfway through the second reply.
+        for request in range(2):
+            await reader.readline()
+            headers = await chat_proxy.read_headers(reader)
+            await reader.readexactly(int(headers['content-length']))
+            writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n")
+            for word in ("tok1 ", "tok2 ", "tok3 "):
+                event = {'candidates': [{'content': {'parts': [{'text': word}]}}]}
+                data = f"data: {json.dumps(event)}\r\n\r\n".encode()
+                writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                await writer.drain()
+                if request == 1:
+                    writer.close()
+                    return
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+
+    async def scenario():
+        proxy, server, stub, connections = await start_proxy(flaky_backend)
+        try:
+            status, _, events = await post_chat(server, "first")
+            assert status == 200
+            assert reply_text(events) == "tok1 tok2 tok3 "
+
+            status, _, events = await post_chat(server, "second")
+            assert status == 200
+            assert reply_text(events) == "tok1 "
+            assert events[-1][0] == "error"
+            # No second attempt was spliced on, and nothing partial was cached
+            assert len(connections) == 1
+            assert proxy.cache.stats()['entries'] == 1
+        finally:
+            await stop(proxy, server, stub)
+
+    asyncio.run(scenario())
+
+
+def test_stalled_backend_times_out(monkeypatch):
+    monkeypatch.setattr(chat_proxy, "BACKEND_READ_TIMEOUT", 0.2)
+
+    async def stalled_backend(reader, writer):
+        await reader.read()
+
+    async def scenario():
+        proxy, server, stub, _ = await start_proxy(stalled_backend)
+        try:
+            status, _, body = await asyncio.wait_for(post_chat(server, "anyone there?"), 5)
+            assert status == 502
+            assert body['error'] == "backend timed out"
+            assert proxy.backend.idle == []
+        finally:
+            await stop(proxy, server, stub)
+
+    asyncio.run(scenario())
+
+
+def test_cache_expires_and_evicts_least_recently_used(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(chat_proxy.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(max_entries=2, ttl=60)
+
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+
+    now[0] += 61
+    assert cache.get("a") is None
+    assert cache.stats() == {'entries': 1, 'hits': 2, 'misses': 2}
+
+
+def test_iter_body_framings():
+    async def read(raw, headers):
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return b"".join([chunk async for chunk in iter_body(reader, headers)]), reader
+
+    async def scenario():
+        body, reader = await read(b"5\r\nhello\r\n6;ext=1\r\n world\r\n0\r\nX-Trailer: 1\r\n\r\nNEXT",
+                                  {'transfer-encoding': 'chunked'})
+        assert body == b"hello world"
+        assert await reader.read() == b"NEXT"
+
+        body, reader = await read(b"helloNEXT", {'content-length': '5'})
+        assert body == b"hello"
+        assert await reader.read() == b"NEXT"
+
+        body, _ = await read(b"until close", {})
+        assert body == b"until close"
+
+        # A chunked body cut off before its terminating chunk, or inside the
+        # trailer section, is an error rather than a complete reply.
+        for truncated in (b"5\r\nhello\r\n", b"5\r\nhello\r\n0\r\n", b"5\r\nhello\r\n0\r\nX-Trailer: 1"):
+            with pytest.raises(BackendError):
+                await read(truncated, {'transfer-encoding': 'chunked'})
+        with pytest.raises(BackendError):
+            await read(b"zz\r\nhello\r\n", {'transfer-encoding': 'chunked'})
+
+    asyncio.run(scenario())